@@ -0,0 +1,253 @@
+"""
+Change detection — per-pixel anomalies against a seasonal baseline
+==================================================================
+Keeps, for every pixel and every index, a **rolling day-of-year baseline**:
+the year is split into `DOY_BINS` windows and each window remembers the last
+`DEPTH` observations that fell into it (a ring buffer, oldest overwritten
+first).  A new scene is scored against the median / MAD of its window:
+
+    z = (x - median) / (1.4826 · MAD)
+
+so values around ±3 mean "unusual for this time of year at this pixel".
+
+* **Vectorised**: every index of a scene is scored in one NumPy pass over an
+  `(index, row, col)` stack — no per-pixel Python loops.
+* **Incremental**: updating the baseline writes one slot of the ring buffer;
+  the multi-year history is never re-read or recomputed.
+* **Connected regions**: pixels beyond the z threshold are grouped into
+  8-connected regions and summarised (size, mean / worst z, centroid) so the
+  dashboard can list "where" and not just "how much".
+
+A persistent baseline lives in a directory: the ring buffer is a
+memory-mapped `buffer.npy` (so an update only writes the pages of the one slot
+it touches), and `state.json` holds the ring cursors, the ids of the scenes
+already folded in (re-running a scene never counts it twice) and a `uid` that
+changes whenever the baseline is started afresh.
+"""
+
+import os
+import json
+import uuid
+import warnings
+
+import numpy as np
+
+MAD_SCALE = 1.4826   # MAD → σ for normally distributed data
+
+
+class SeasonalBaseline:
+    """Rolling per-pixel day-of-year median / MAD baseline."""
+
+    def __init__(self, n_indices, shape, doy_bins=24, depth=5, min_obs=3, mad_floor=0.01,
+                 buffer=None):
+        self.doy_bins  = doy_bins
+        self.depth     = depth
+        self.min_obs   = min_obs
+        self.mad_floor = mad_floor   # index units; stops near-flat histories exploding z
+        # buffer[bin, slot, index, row, col]; NaN = empty slot / no data
+        if buffer is None:
+            buffer = np.full((doy_bins, depth, n_indices) + tuple(shape), np.nan, dtype=np.float32)
+        self.buffer    = buffer
+        self.cursor    = np.zeros(doy_bins, dtype=np.int64)   # next slot to overwrite
+        self.scenes    = []                                   # ids already folded in
+        self.uid       = uuid.uuid4().hex[:12]                # identity of this history
+        self.directory = None                                 # set for persistent baselines
+
+    # ──────────────────────────────────────────────────────────
+    # Persistence
+    # ──────────────────────────────────────────────────────────
+    @classmethod
+    def open(cls, directory, n_indices, shape, doy_bins=24, depth=5, **kwargs):
+        """Open the persistent baseline in `directory`, or start an empty one
+        (with a new `uid`) if it is missing, unreadable or laid out for a
+        different grid."""
+        full_shape = (doy_bins, depth, n_indices) + tuple(shape)
+        buf_path   = os.path.join(directory, 'buffer.npy')
+        state_path = os.path.join(directory, 'state.json')
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            buffer = np.lib.format.open_memmap(buf_path, mode='r+')
+            if buffer.shape != full_shape or buffer.dtype != np.float32:
+                raise ValueError('layout mismatch')
+            base = cls(n_indices, shape, doy_bins, depth, buffer=buffer, **kwargs)
+            base.cursor = np.asarray(state['cursor'], dtype=np.int64)
+            base.scenes = list(state['scenes'])
+            base.uid    = state['uid']
+        except (OSError, ValueError, KeyError):
+            if os.path.exists(state_path):
+                print(f'   ⚠️  Baseline in {directory} is unusable → starting afresh.')
+            buffer = np.lib.format.open_memmap(buf_path, mode='w+', dtype=np.float32, shape=full_shape)
+            buffer[:] = np.nan
+            buffer.flush()
+            base = cls(n_indices, shape, doy_bins, depth, buffer=buffer, **kwargs)
+        base.directory = directory
+        base._save_state()
+        return base
+
+    def _save_state(self):
+        """Atomically write cursors / scene ids / uid next to the buffer."""
+        if self.directory is None:
+            return
+        path = os.path.join(self.directory, 'state.json')
+        tmp  = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'uid': self.uid, 'cursor': self.cursor.tolist(), 'scenes': self.scenes}, f)
+        os.replace(tmp, path)
+
+    # ──────────────────────────────────────────────────────────
+    # Scoring & updating
+    # ──────────────────────────────────────────────────────────
+    def doy_bin(self, doy):
+        """Map a day-of-year (1–366) to its baseline window."""
+        return min((int(doy) - 1) * self.doy_bins // 366, self.doy_bins - 1)
+
+    def score(self, doy, stack):
+        """Robust z-score of `stack` (index, row, col) against its DOY window.
+
+        Pixels whose window holds fewer than `min_obs` valid observations are
+        returned as NaN.
+        """
+        window = self.buffer[self.doy_bin(doy)]             # (slot, index, row, col)
+        n_obs  = np.sum(~np.isnan(window), axis=0)
+        with np.errstate(all='ignore'), warnings.catch_warnings():
+            # nanmedian warns on all-NaN slices (pixels outside the AOI)
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            median = np.nanmedian(window, axis=0)
+            mad    = np.nanmedian(np.abs(window - median), axis=0)
+            z = (stack - median) / np.maximum(MAD_SCALE * mad, self.mad_floor)
+        z[n_obs < self.min_obs] = np.nan
+        return z.astype(np.float32)
+
+    def update(self, scene_id, doy, stack):
+        """Fold one scene into its DOY window (overwriting the oldest slot).
+
+        No-data pixels (NaN — e.g. red-edge indices of a Landsat scene) leave
+        the slot's previous value in place rather than erasing history.
+
+        For a persistent baseline only the touched slot is flushed, then the
+        small state file.  A crash in between just rewrites the same slot with
+        the same data on the next attempt, since the cursor has not moved.
+        """
+        if scene_id in self.scenes:
+            return
+        b = self.doy_bin(doy)
+        slot = self.buffer[b, self.cursor[b] % self.depth]
+        np.copyto(slot, stack, where=np.isfinite(stack))
+        if isinstance(self.buffer, np.memmap):
+            self.buffer.flush()   # msync: only the slot's dirty pages hit disk
+        self.cursor[b] += 1
+        self.scenes.append(scene_id)
+        self._save_state()
+
+
+def chain_intact(*previous):
+    """Whether the next scene of a date-ordered change chain may be folded in.
+
+    `previous` is the result of the scene before (absent for the first scene,
+    `None` if it failed).  The baseline must only ever hold scenes older than
+    the one scored, so once a scene is missing every later one is scored but
+    not folded in, until a later run fills the gap.
+    """
+    return not previous or bool(previous[0] and previous[0].get('folded', True))
+
+
+# ──────────────────────────────────────────────────────────────
+# CONNECTED ANOMALY REGIONS
+# ──────────────────────────────────────────────────────────────
+def label_regions(mask):
+    """8-connected component labelling of a boolean mask (0 = background).
+
+    Scanline union-find: every row is split into horizontal runs, runs in
+    consecutive rows that touch (diagonals included) are merged, and each
+    pixel takes its run's label.  Linear in the number of runs, whatever the
+    regions' shape — no iterating until labels settle.  Labels are numbered
+    1..n in row-major order of their first pixel.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rows, cols = mask.shape
+    labels = np.zeros(mask.shape, dtype=np.int64)
+    if not mask.any():
+        return labels
+
+    left  = np.pad(mask, ((0, 0), (1, 0)))[:, :-1]
+    right = np.pad(mask, ((0, 0), (0, 1)))[:, 1:]
+    run_r, run_c0 = np.nonzero(mask & ~left)
+    _, run_c1     = np.nonzero(mask & ~right)        # same row-major order
+    n_runs = len(run_r)
+
+    # For run b, the touching runs of the row above form a contiguous range
+    # (runs in a row are disjoint and sorted): a.c1 ≥ b.c0 - 1 and
+    # a.c0 ≤ b.c1 + 1.  Row-offset keys make one searchsorted do every row.
+    width  = cols + 2
+    key_c0 = run_r * width + run_c0 + 1
+    key_c1 = run_r * width + run_c1 + 1
+    b  = np.nonzero(run_r > 0)[0]
+    up = (run_r[b] - 1) * width
+    lo = np.searchsorted(key_c1, up + run_c0[b], side='left')
+    hi = np.searchsorted(key_c0, up + run_c1[b] + 2, side='right')
+    n_pairs = np.maximum(hi - lo, 0)
+    src = np.repeat(b, n_pairs)
+    dst = np.repeat(lo, n_pairs) + np.arange(n_pairs.sum()) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+
+    parent = list(range(n_runs))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]   # path halving
+            x = parent[x]
+        return x
+
+    for a, c in zip(src.tolist(), dst.tolist()):
+        ra, rc = find(a), find(c)
+        if ra != rc:
+            parent[max(ra, rc)] = min(ra, rc)
+
+    roots = np.fromiter((find(i) for i in range(n_runs)), dtype=np.int64, count=n_runs)
+    run_label = np.unique(roots, return_inverse=True)[1].reshape(-1) + 1
+    # Row-major cumulative count of run starts = run index of every pixel
+    run_of_pixel = np.cumsum((mask & ~left).ravel())[mask.ravel()] - 1
+    labels[mask] = run_label[run_of_pixel]
+    return labels
+
+
+def summarise_regions(z, z_thr=3.0, min_pixels=4, max_regions=10, pixel_area_m2=100.0):
+    """Group pixels with z ≤ -`z_thr` (low) or z ≥ `z_thr` (high) into
+    regions, largest first.
+
+    Returns a list of dicts with pixel count, area, mean / extreme z, the
+    anomaly type and the centroid in (row, col) pixel coordinates.  The
+    per-region statistics are gathered in one pass with `np.bincount`.
+    """
+    z_filled = np.nan_to_num(z)
+    regions  = []
+    for kind, mask in (('low', z_filled <= -z_thr), ('high', z_filled >= z_thr)):
+        if not mask.any():
+            continue
+        labels = label_regions(mask)
+        n   = int(labels.max()) + 1
+        lab = labels[mask]
+        vals = z[mask].astype(np.float64)
+        rr, cc = np.nonzero(mask)
+
+        count   = np.bincount(lab, minlength=n)
+        z_sum   = np.bincount(lab, weights=vals, minlength=n)
+        r_sum   = np.bincount(lab, weights=rr, minlength=n)
+        c_sum   = np.bincount(lab, weights=cc, minlength=n)
+        extreme = np.full(n, np.inf if kind == 'low' else -np.inf)
+        (np.minimum if kind == 'low' else np.maximum).at(extreme, lab, vals)
+
+        big  = np.nonzero(count >= max(min_pixels, 1))[0]
+        keep = big[np.argsort(-count[big], kind='stable')][:max_regions]
+        for k in keep.tolist():
+            regions.append({
+                'type'       : kind,
+                'n_pixels'   : int(count[k]),
+                'area_km2'   : round(count[k] * pixel_area_m2 / 1e6, 4),
+                'mean_z'     : round(float(z_sum[k] / count[k]), 3),
+                'extreme_z'  : round(float(extreme[k]), 3),
+                'centroid_rc': [float(r_sum[k] / count[k]), float(c_sum[k] / count[k])],
+            })
+    regions.sort(key=lambda r: r['n_pixels'], reverse=True)
+    return regions[:max_regions]
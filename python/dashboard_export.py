@@ -0,0 +1,198 @@
+"""
+Dashboard export — lazily built, content-hashed JSON sections
+=============================================================
+Instead of one monolithic `dashboard_data.json`, the dashboard payload is
+split into independent **sections** (`meta`, `aoi`, `predictions`, one file
+per timeseries column group and year, …) plus a small `manifest.json`:
+
+    {
+      "generated": "2025-06-08T03:58:03Z",
+      "sections": {
+        "timeseries-means-2025": {"path": "timeseries-means-2025.json",
+                                  "hash": "3f1c…", "bytes": 18211, "key": "…"},
+        …
+      }
+    }
+
+* **Lazy**: a section is registered with a builder callable and an optional
+  input `key`.  If the key matches the manifest (and the file is still on
+  disk) the builder is never called.
+* **Content hashed**: a built section is only rewritten when the hash of its
+  serialised content changed, so a run that only adds the newest scenes
+  touches the current year's timeseries files and leaves the rest alone.
+* **Selective**: the front-end reads the manifest and fetches only the
+  sections a view needs (`?v=<hash>` makes them safe to cache forever).
+
+Can also be run as a script to split a legacy monolithic file:
+
+    python dashboard_export.py ../output/dashboard/dashboard_data.json \\
+                               ../satellite-dashboard/public/dashboard
+"""
+
+import os
+import sys
+import json
+import math
+import hashlib
+from datetime import datetime, timezone
+
+MANIFEST = 'manifest.json'
+ROW_KEYS = ('date', 'sensor')   # kept in every timeseries group
+
+# Timeseries column groups → which chart needs them
+TIMESERIES_GROUPS = {
+    'means' : lambda col: col.endswith('_mean'),                       # temporal / predictions
+    'spread': lambda col: col.endswith(('_min', '_max', '_std')),      # min / max / std bands
+    'area'  : lambda col: col.startswith('area_'),                     # area-coverage chart
+}
+
+
+def clean(obj):
+    """Make `obj` strict-JSON safe (NaN / inf → null) without touching the rest."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: clean(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [clean(v) for v in obj]
+    return obj
+
+
+def digest(payload):
+    """sha1 of the canonical JSON form of `payload`."""
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class SectionWriter:
+    """Collects lazily built sections and writes only those that changed."""
+
+    def __init__(self, out_dir):
+        self.out_dir  = out_dir
+        self.sections = {}   # name → (build, key)
+        os.makedirs(out_dir, exist_ok=True)
+        try:
+            with open(os.path.join(out_dir, MANIFEST), encoding='utf-8') as f:
+                self.previous = json.load(f).get('sections', {})
+        except (OSError, ValueError):
+            self.previous = {}
+
+    def add(self, name, build, key=None):
+        """Register section `name`; `build()` returns its JSON-able content.
+
+        `key` summarises the section's inputs.  When it is given and matches
+        the previous run, the section is reused without calling `build`.
+        """
+        self.sections[name] = (build, key)
+
+    def _write_atomic(self, path, payload):
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+    def write(self):
+        """Build what is needed, rewrite what changed, refresh the manifest.
+
+        Returns a `{'written': [...], 'unchanged': [...], 'removed': [...]}`
+        summary.
+        """
+        manifest = {}
+        summary  = {'written': [], 'unchanged': [], 'removed': []}
+
+        for name, (build, key) in self.sections.items():
+            prev = self.previous.get(name)
+            path = f'{name}.json'
+            full = os.path.join(self.out_dir, path)
+            on_disk = prev is not None and os.path.isfile(full)
+
+            if key is not None and on_disk and prev.get('key') == key:
+                manifest[name] = prev
+                summary['unchanged'].append(name)
+                continue
+
+            payload = json.dumps(clean(build()), ensure_ascii=False,
+                                 separators=(',', ':'), default=str, allow_nan=False)
+            content_hash = digest(payload)
+            if on_disk and prev.get('hash') == content_hash:
+                summary['unchanged'].append(name)
+            else:
+                self._write_atomic(full, payload)
+                summary['written'].append(name)
+            manifest[name] = {
+                'path' : path,
+                'hash' : content_hash,
+                'bytes': len(payload.encode('utf-8')),
+                'key'  : key,
+            }
+
+        # Sections that disappeared (e.g. zones switched off) are deleted.
+        for name, prev in self.previous.items():
+            if name not in manifest:
+                stale = os.path.join(self.out_dir, prev['path'])
+                if os.path.isfile(stale):
+                    os.remove(stale)
+                summary['removed'].append(name)
+
+        self._write_atomic(
+            os.path.join(self.out_dir, MANIFEST),
+            json.dumps({
+                'generated': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'sections' : manifest,
+            }, indent=2),
+        )
+        return summary
+
+
+def add_timeseries_sections(writer, records, prefix='timeseries', key=None):
+    """Register one section per column group and calendar year.
+
+    `records` are the timeseries rows (each with a `date`, optionally a
+    `sensor`).  Splitting by year keeps history files byte-identical between
+    runs; splitting by group lets each chart download only the columns it
+    plots.  `key(group, rows)`, if given, returns the input key of one
+    section so unchanged years are not even rebuilt.
+    """
+    by_year = {}
+    for rec in records:
+        by_year.setdefault(str(rec['date'])[:4], []).append(rec)
+
+    for group, wanted in TIMESERIES_GROUPS.items():
+        for year, rows in sorted(by_year.items()):
+            writer.add(
+                f'{prefix}-{group}-{year}',
+                lambda rows=rows, wanted=wanted: [
+                    {c: v for c, v in r.items() if c in ROW_KEYS or wanted(c)}
+                    for r in rows
+                ],
+                key=key(group, rows) if key else None,
+            )
+
+
+def split_legacy(src, out_dir):
+    """Turn a monolithic `dashboard_data.json` into sections."""
+    with open(src, encoding='utf-8') as f:
+        data = json.load(f)
+
+    writer = SectionWriter(out_dir)
+    writer.add('meta', lambda: {
+        'generated' : data.get('generated'),
+        'parameters': data.get('parameters'),
+        'tile_url'  : data.get('tile_url'),
+    })
+    writer.add('aoi', lambda: data.get('aoi'))
+    writer.add('predictions', lambda: data.get('predictions', {}))
+    writer.add('alerts', lambda: data.get('alerts', []))
+    if 'anomalies' in data:
+        writer.add('anomalies', lambda: data['anomalies'])
+    if 'zones' in data:
+        writer.add('zones', lambda: data['zones'])
+    add_timeseries_sections(writer, data.get('timeseries', []))
+    return writer.write()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit('usage: python dashboard_export.py <dashboard_data.json> <out_dir>')
+    result = split_legacy(sys.argv[1], sys.argv[2])
+    print(f"✅ {len(result['written'])} section(s) written, "
+          f"{len(result['unchanged'])} unchanged, {len(result['removed'])} removed.")
@@ -0,0 +1,158 @@
+"""
+Geometry preprocessing — valid, simplified, cached, spatially indexed
+=====================================================================
+Heavy cadastral polygons (hundreds to thousands of vertices) are
+shipped into *every* Earth Engine request and clipped server-side each time.
+At a 10 m analysis grid most of those vertices are noise, so before anything
+touches EE the AOI / zone layers are:
+
+1. **Validated**   — self-intersections etc. repaired with `make_valid`
+                     (only polygonal parts are kept).
+2. **Simplified**  — in the local UTM zone; no boundary moves by more than
+                     the tolerance in metres (default half a 10 m pixel).
+                     A layer of several polygons that tile without gaps or
+                     overlaps (the zones) is simplified as a *coverage*, so
+                     shared edges stay shared; a single polygon, or a layer
+                     that is not a clean coverage, is simplified polygon by
+                     polygon with Douglas–Peucker.
+3. **Cached**      — the simplified GeoJSON is stored next to the outputs,
+                     keyed by the source file's bytes and the tolerance, so
+                     later runs skip steps 1–2 and build the EE object directly.
+4. **Indexed**     — `ZoneIndex` wraps a shapely `STRtree` so a scene
+                     footprint is matched only to the zones it actually
+                     intersects.
+"""
+
+import os
+import json
+import hashlib
+
+import geopandas as gpd
+import shapely
+from shapely.geometry import shape, mapping
+from shapely.ops import unary_union
+
+DEFAULT_TOLERANCE_M = 5.0   # half a 10 m pixel
+CACHE_VERSION       = 2     # bump when the simplification itself changes
+
+
+def vertex_count(gdf):
+    """Total number of coordinates in a GeoDataFrame."""
+    return int(shapely.get_num_coordinates(gdf.geometry.values).sum())
+
+
+def _polygonal(geom):
+    """Keep only the (multi)polygon part of a `make_valid` result."""
+    if geom.geom_type in ('Polygon', 'MultiPolygon'):
+        return geom
+    parts = [g for g in getattr(geom, 'geoms', []) if g.geom_type in ('Polygon', 'MultiPolygon')]
+    return unary_union(parts) if parts else None
+
+
+def _coverage_simplify(geoms, tolerance_m, attempts=8):
+    """`shapely.coverage_simplify` held to a maximum deviation of `tolerance_m`.
+
+    Its tolerance is a Visvalingam–Whyatt one (≈ √ of the removed triangles'
+    area), not a distance: a long thin spike can vanish at a "tolerance" far
+    below its length.  The VW tolerance is halved until the Hausdorff
+    distance of every polygon is within `tolerance_m`; `None` if it never is.
+    """
+    vw_tolerance = tolerance_m
+    for _ in range(attempts):
+        simplified = shapely.coverage_simplify(geoms, vw_tolerance)
+        if shapely.hausdorff_distance(geoms, simplified).max() <= tolerance_m:
+            return simplified
+        vw_tolerance /= 2
+    return None
+
+
+def simplify_polygons(gdf, tolerance_m=DEFAULT_TOLERANCE_M):
+    """Validate and simplify polygons; returns a new EPSG:4326 GeoDataFrame."""
+    gdf = gdf.to_crs(4326) if gdf.crs else gdf.set_crs(4326)
+    utm = gdf.estimate_utm_crs()
+    out = gdf.to_crs(utm)
+    out['geometry'] = shapely.make_valid(out.geometry.values)
+    out['geometry'] = out.geometry.apply(_polygonal)
+    out = out[out.geometry.notna() & ~out.geometry.is_empty]
+    geoms = out.geometry.values
+    simplified = None
+    if len(out) > 1 and hasattr(shapely, 'coverage_simplify') and shapely.coverage_is_valid(geoms):
+        # Simplifies each shared edge once, so neighbours keep a common border
+        simplified = _coverage_simplify(geoms, tolerance_m)
+    if simplified is None:
+        if len(out) > 1:
+            print('   ⚠️  Polygons cannot be simplified as a coverage within tolerance → '
+                  'simplifying each one separately; shared edges may drift apart.')
+        simplified = out.geometry.simplify(tolerance_m, preserve_topology=True).values
+    out['geometry'] = simplified
+    # KML-derived layers carry a Z coordinate that EE does not need
+    out['geometry'] = shapely.force_2d(out.geometry.values)
+    return out.to_crs(4326)
+
+
+def to_geojson(gdf):
+    """GeoJSON dict of `gdf`; array-valued KML properties become plain lists."""
+    return json.loads(gdf.to_json(
+        drop_id=True,
+        default=lambda o: o.tolist() if hasattr(o, 'tolist') else str(o),
+    ))
+
+
+def load_prepared(path, cache_dir, tolerance_m=DEFAULT_TOLERANCE_M):
+    """Read `path` and return its simplified GeoDataFrame, using the cache.
+
+    The cache key covers the file content, the tolerance and `CACHE_VERSION`,
+    so editing the source polygon or changing the tolerance rebuilds it
+    automatically.
+    """
+    with open(path, 'rb') as f:
+        key = hashlib.sha1(f.read() + f'{tolerance_m}/{CACHE_VERSION}'.encode()).hexdigest()[:12]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f'{stem}-{key}.geojson')
+
+    if os.path.isfile(cache_path):
+        return gpd.read_file(cache_path)
+
+    raw = gpd.read_file(path)
+    gdf = simplify_polygons(raw, tolerance_m)
+    print(f'   {stem}: {vertex_count(raw)} → {vertex_count(gdf)} vertices '
+          f'(tolerance {tolerance_m} m)')
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = f'{cache_path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(to_geojson(gdf), f, ensure_ascii=False)
+    os.replace(tmp, cache_path)
+    return gdf
+
+
+def to_ee_geometry(gdf):
+    """Dissolved client-side geometry → a single `ee.Geometry` (no server union)."""
+    import ee
+    return ee.Geometry(mapping(unary_union(gdf.geometry.values)))
+
+
+def to_ee_features(gdf):
+    """GeoDataFrame → `ee.FeatureCollection` straight from its GeoJSON."""
+    import ee
+    return ee.FeatureCollection(to_geojson(gdf))
+
+
+class ZoneIndex:
+    """STRtree over zone polygons, keyed by the zones' `key_col` values."""
+
+    def __init__(self, zones_gdf, key_col='zone'):
+        self.keys = [str(k) for k in zones_gdf[key_col]]
+        self.tree = shapely.STRtree(zones_gdf.geometry.values)
+
+    def query(self, geom):
+        """Keys of the zones that intersect `geom` (shapely or GeoJSON dict).
+
+        EE returns `system:footprint` as a `LinearRing`; a ring only
+        intersects zones that cross its outline, so closed rings are turned
+        into the polygon they bound before querying.
+        """
+        if isinstance(geom, dict):
+            geom = shape(geom)
+        if geom.geom_type in ('LinearRing', 'LineString') and geom.is_closed:
+            geom = shapely.Polygon(geom)
+        return [self.keys[i] for i in self.tree.query(geom, predicate='intersects')]
@@ -1,8 +1,9 @@
 """
-Pipeline v2 — Dashboard-ready JSON exporter (UPDATED with new vegetation indices)
-===============================================================================
+Pipeline v3 — Dashboard-ready sectioned JSON exporter
+=====================================================
 This script builds on the original Earth Engine workflow and adds **richer
-outputs** so a front-end can render a full dashboard from a **single JSON file**.
+outputs** so a front-end can render a full dashboard from a set of
+**content-hashed JSON sections** listed in `SECTIONS_DIR/manifest.json`.
 
 **⚠️  CHANGES IN THIS VERSION**
 --------------------------------
@@ -17,18 +18,48 @@ outputs** so a front-end can render a full dashboard from a **single JSON file**
     · ND_790_720  (Normalized Difference 790/720 nm)
 • Updated all loops / reducers / threshold dict to reflect the new band names.
 • Latest-image tile is now generated from **NDVI** (still the most common backdrop).
+• The run is now a **checkpointed task DAG** (see `scheduler.py`): scenes are
+  fetched and reduced in batches, every finished task is persisted under
+  `CHECKPOINT_DIR`, failed tasks are retried on their own and a re-run resumes
+  from the last completed task instead of starting from scratch.
+• New **change-detection** stage (see `change_detection.py`): every scene is
+  scored per pixel against a rolling day-of-year median/MAD baseline that is
+  updated slot by slot in a memory-mapped buffer; anomaly rasters go to
+  `OUT_DIR/anomalies/` and the connected anomaly regions are listed under
+  the `anomalies` section.
+• The single `dashboard_data.json` is replaced by **lazily built,
+  content-hashed sections** (see `dashboard_export.py`) written to
+  `SECTIONS_DIR`: only sections whose content changed are rewritten and the
+  dashboard fetches just the sections each view needs via `manifest.json`.
+• **Multi-sensor ingestion** (see `sensors.py`): Sentinel-2 and Landsat 8/9
+  are mapped onto common band roles, scaled to surface reflectance and merged
+  into one time-ordered stream that feeds the same batched stats pass.  Every
+  timeseries row records its `sensor`; the per-sensor scene count and EE
+  time are printed and exported in the `meta` section.
+• **Geometry preprocessing** (see `geometry.py`): AOI and zone polygons are
+  validated, simplified to `SIMPLIFY_TOLERANCE_M` in UTM and cached, the AOI
+  is sent to EE as one pre-dissolved geometry, and an STRtree matches each
+  scene footprint to the zones it actually touches before zonal reduction.
 
 """
 
 import os
 import json
+import time
+import hashlib
 from datetime import date, timedelta, datetime, timezone
 
 import ee
-import geemap
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+from shapely.ops import unary_union
+
+from scheduler import Scheduler
+from change_detection import SeasonalBaseline, chain_intact, summarise_regions
+from dashboard_export import SectionWriter, add_timeseries_sections
+from sensors import merged_collection
+from geometry import load_prepared, to_ee_geometry, to_ee_features, to_geojson, ZoneIndex
 
 # ──────────────────────────────────────────────────────────────
 # USER PARAMETERS — edit as required
@@ -38,6 +69,7 @@ ZONES_GEOJSON = None                                           # optional sub-zo
 DATE_START    = '2020-01-01'
 DATE_END      = date.today().strftime('%Y-%m-%d')
 CLOUD_MAX_PCT = 5                                              # % cloud filter
+SENSORS       = ['S2', 'L8', 'L9']                             # see sensors.py
 THRESHOLDS = {                                                 # alert / area rules
     'NDVI'       : [0.40, 0.60],
     'SAVI'       : [0.30],
@@ -46,6 +78,26 @@ THRESHOLDS = {                                                 # alert / area ru
 }
 PREDICT_WINDOW = 10        # how many recent obs to fit regression
 OUT_DIR        = '../output/dashboard'
+SECTIONS_DIR   = '../satellite-dashboard/public/dashboard'   # served to the front-end
+CHECKPOINT_DIR = os.path.join(OUT_DIR, '.checkpoints')
+GEOMETRY_CACHE = os.path.join(OUT_DIR, '.geometry')
+SIMPLIFY_TOLERANCE_M = 5.0 # max boundary shift when simplifying (m) — half a 10 m pixel
+SCENE_BATCH    = 25        # scenes reduced per EE request (one task each)
+TASK_RETRIES   = 3         # extra attempts per failed task
+CHANGE_INDICES = ['NDVI', 'ND_800_680']   # indices scored for per-pixel anomalies
+CHANGE_Z_THR   = 3.0       # |robust z| that flags a pixel as anomalous
+BASELINE_DOY_BINS = 24     # seasonal windows per year (~15 days each)
+BASELINE_DEPTH    = 5      # past observations kept per window and pixel
+STAGE_CONCURRENCY = {      # max concurrent tasks per stage
+    'fetch'   : 1,
+    'stats'   : 4,
+    'zonal'   : 2,
+    'pixels'  : 4,
+    'change'  : 1,         # baseline updates must stay in date order
+    'forecast': 1,
+    'tile'    : 1,
+    'export'  : 1,
+}
 
 # ──────────────────────────────────────────────────────────────
 # INITIALISE EE & READ GEOMETRIES
@@ -55,47 +107,48 @@ ee.Initialize()
 
 # Load AOI as EE geometry
 print('➡️  Loading AOI…')
-aoi_gdf = gpd.read_file(AOI_GEOJSON)
-aoi_fc  = geemap.geopandas_to_ee(aoi_gdf)
-aoi_geom = aoi_fc.geometry()
+aoi_gdf  = load_prepared(AOI_GEOJSON, GEOMETRY_CACHE, SIMPLIFY_TOLERANCE_M)
+aoi_geom = to_ee_geometry(aoi_gdf)   # dissolved client-side, no server union
 
-# Optional zones layer (must have a column called "zone" or "id")
+# Optional zones layer (uses a "zone" column, else "id", else the row number)
 if ZONES_GEOJSON and os.path.isfile(ZONES_GEOJSON):
-    zones_gdf = gpd.read_file(ZONES_GEOJSON)
-    # Ensure there is an id column
-    if 'zone' not in zones_gdf.columns and 'id' not in zones_gdf.columns:
-        zones_gdf['zone'] = zones_gdf.index.astype(str)
-    zones_fc = geemap.geopandas_to_ee(zones_gdf)
+    zones_gdf = load_prepared(ZONES_GEOJSON, GEOMETRY_CACHE, SIMPLIFY_TOLERANCE_M)
+    # Ensure there is a zone key column
+    if 'zone' not in zones_gdf.columns:
+        zones_gdf['zone'] = zones_gdf['id'] if 'id' in zones_gdf.columns else zones_gdf.index
+    zones_gdf['zone'] = zones_gdf['zone'].astype(str)
+    # Zones outside the AOI can never receive a pixel → drop them up front
+    inside     = ZoneIndex(zones_gdf).query(unary_union(aoi_gdf.geometry.values))
+    zones_gdf  = zones_gdf[zones_gdf['zone'].isin(inside)]
+    zones_fc   = to_ee_features(zones_gdf)
+    zone_index = ZoneIndex(zones_gdf)
     USE_ZONES = True
     print(f'   Loaded {len(zones_gdf)} management zones.')
 else:
-    zones_fc = None
+    zones_fc   = None
+    zone_index = None
     USE_ZONES = False
     print('   No management zones supplied → zone stats will be skipped.')
 
 # ──────────────────────────────────────────────────────────────
-# BUILD SENTINEL-2 COLLECTION WITH INDICES
+# BUILD HARMONISED MULTI-SENSOR COLLECTION WITH INDICES
 # ──────────────────────────────────────────────────────────────
-print('➡️  Building Sentinel-2 ImageCollection…')
-s2 = (
-    ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED')
-    .filterBounds(aoi_geom)
-    .filterDate(DATE_START, DATE_END)
-    .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', CLOUD_MAX_PCT))
-)
+print(f"➡️  Building harmonised ImageCollection ({', '.join(SENSORS)})…")
+scenes_col = merged_collection(SENSORS, aoi_geom, DATE_START, DATE_END, CLOUD_MAX_PCT)
 
-# Add the new spectral indices to every image
+# Add the new spectral indices to every image (bands are the roles of sensors.py;
+# red-edge roles are masked for Landsat, so the red-edge indices are S2-only)
 def add_indices(img):
-    """Attach all required spectral indices to a Sentinel-2 image."""
+    """Attach all required spectral indices to a harmonised image."""
     # 1. Normalised Difference NIR / Red  (standard NDVI)
-    ndvi = img.normalizedDifference(['B8', 'B4']).rename('NDVI')
+    ndvi = img.normalizedDifference(['NIR', 'RED']).rename('NDVI')
 
     # 2. Soil-Adjusted Vegetation Index (L = 0.5)
     savi = img.expression(
         '((NIR - RED) / (NIR + RED + L)) * (1 + L)',
         {
-            'NIR': img.select('B8'),
-            'RED': img.select('B4'),
+            'NIR': img.select('NIR'),
+            'RED': img.select('RED'),
             'L'  : 0.5,
         },
     ).rename('SAVI')
@@ -104,23 +157,23 @@ def add_indices(img):
     gli = img.expression(
         '((2 * G) - R - B) / ((2 * G) + R + B)',
         {
-            'G': img.select('B3'),
-            'R': img.select('B4'),
-            'B': img.select('B2'),
+            'G': img.select('GREEN'),
+            'R': img.select('RED'),
+            'B': img.select('BLUE'),
         },
     ).rename('GLI')
 
-    # 4. Normalised Difference 800/680 nm (using B8 ≈ 842 nm, B5 ≈ 705 nm)
-    nd_800_680 = img.normalizedDifference(['B8', 'B5']).rename('ND_800_680')
+    # 4. Normalised Difference 800/680 nm (using NIR ≈ 842 nm, RE1 ≈ 705 nm)
+    nd_800_680 = img.normalizedDifference(['NIR', 'RE1']).rename('ND_800_680')
 
     # 5. Canopy Chlorophyll Content Index (NIR / red-edge)
-    ccci = img.normalizedDifference(['B8', 'B5']).rename('CCCI')
+    ccci = img.normalizedDifference(['NIR', 'RE1']).rename('CCCI')
 
-    # 6. Normalised Difference 790/670 nm (B7 ≈ 783 nm, B4 ≈ 665 nm)
-    nd_790_670 = img.normalizedDifference(['B7', 'B4']).rename('ND_790_670')
+    # 6. Normalised Difference 790/670 nm (RE3 ≈ 783 nm, RED ≈ 665 nm)
+    nd_790_670 = img.normalizedDifference(['RE3', 'RED']).rename('ND_790_670')
 
-    # 7. Normalised Difference 790/720 nm (B7 ≈ 783 nm, B6 ≈ 740 nm)
-    nd_790_720 = img.normalizedDifference(['B7', 'B6']).rename('ND_790_720')
+    # 7. Normalised Difference 790/720 nm (RE3 ≈ 783 nm, RE2 ≈ 740 nm)
+    nd_790_720 = img.normalizedDifference(['RE3', 'RE2']).rename('ND_790_720')
 
     return (
         img.addBands([
@@ -132,14 +185,16 @@ def add_indices(img):
             nd_790_670,
             nd_790_720,
         ])
-        .copyProperties(img, ['system:time_start'])
+        .copyProperties(img, ['system:time_start', 'system:footprint', 'sensor', 'scene_id'])
     )
 
-idx_col = (
-    s2.map(add_indices)
-    .sort('system:time_start', True)  # oldest → newest
-)
-print(f'   Collection length: {idx_col.size().getInfo()} images')
+def scene_collection(scene_ids):
+    """Index-augmented collection restricted to the given scene ids."""
+    return (
+        scenes_col.filter(ee.Filter.inList('scene_id', scene_ids))
+        .map(add_indices)
+        .sort('system:time_start', True)  # oldest → newest
+    )
 
 # List of all index band names we'll work with everywhere below
 INDEX_BANDS = [
@@ -152,11 +207,15 @@ INDEX_BANDS = [
     'ND_790_720',
 ]
 
+def fetch_scenes():
+    """Stage `fetch`: list the ids of every scene in the run, oldest first."""
+    scene_ids = scenes_col.aggregate_array('scene_id').getInfo()
+    print(f'   Collection length: {len(scene_ids)} images')
+    return scene_ids
+
 # ──────────────────────────────────────────────────────────────
 # PER-IMAGE AOI STATISTICS
 # ──────────────────────────────────────────────────────────────
-print('➡️  Computing per-image statistics (whole AOI)…')
-
 def reducer_full():
     """Combined reducer: mean, min, max, stdDev for a single band."""
     return (
@@ -168,7 +227,11 @@ def reducer_full():
 
 # Function to create per-image feature with AOI metrics
 def img_stats(img):
-    props = {'date': img.date().format('YYYY-MM-dd')}
+    props = {
+        'date'    : img.date().format('YYYY-MM-dd'),
+        'sensor'  : img.get('sensor'),
+        'scene_id': img.get('scene_id'),   # keys the lazy timeseries sections
+    }
     for band in INDEX_BANDS:
         b = img.select(band)
         stats = b.reduceRegion(
@@ -195,126 +258,410 @@ def img_stats(img):
                     maxPixels = 1e13,
                 ).values().get(0)
                 thr_str = str(thr).replace('.', '_')
-                props[f'area_{band}_{thr_str}'] = area_m2
+                # A band the sensor lacks (red-edge on Landsat) is fully masked:
+                # its area sum would be 0 km², so report no data instead.
+                props[f'area_{band}_{thr_str}'] = ee.Algorithms.If(
+                    ee.Algorithms.IsEqual(stats.get(f'{band}_mean'), None), None, area_m2,
+                )
     return ee.Feature(None, props)
 
-stats_fc   = idx_col.map(img_stats)
-stats_dict = [f['properties'] for f in stats_fc.getInfo()['features']]
-
-aoi_df = pd.DataFrame(stats_dict)
-aoi_df['date'] = pd.to_datetime(aoi_df['date'])
-aoi_df = aoi_df.sort_values('date')
-
-# Convert area columns m²→km² and fill-na with 0
-for col in aoi_df.columns:
-    if col.startswith('area_'):
-        aoi_df[col] = aoi_df[col].astype(float).div(1e6).round(4)  # km²
-
-aoi_df.fillna(value=np.nan, inplace=True)
+def batch_stats(scene_ids):
+    """Stage `stats`: AOI metrics for one batch of scenes (one EE request).
+
+    Returns the per-scene records plus the wall time of the request.  Batches
+    never mix sensors, so that time is the cost of one sensor's scenes.
+    """
+    t0 = time.perf_counter()
+    stats_fc = scene_collection(scene_ids).map(img_stats)
+    records  = [f['properties'] for f in stats_fc.getInfo()['features']]
+    return {'records': records, 'seconds': round(time.perf_counter() - t0, 3)}
+
+def sensor_report(stats_batches):
+    """Scenes, EE seconds and throughput per sensor across all stats batches.
+
+    Every batch holds a single sensor, so its measured request time is added
+    to that sensor as-is.  Batches resumed from checkpoints keep the time of
+    the run that computed them.
+    """
+    report = {}
+    for batch in stats_batches:
+        if not batch['records']:
+            continue
+        entry = report.setdefault(batch['records'][0].get('sensor'), {'scenes': 0, 'seconds': 0.0})
+        entry['scenes']  += len(batch['records'])
+        entry['seconds'] += batch['seconds']
+    for entry in report.values():
+        entry['seconds']        = round(entry['seconds'], 2)
+        entry['scenes_per_sec'] = round(entry['scenes'] / entry['seconds'], 3) if entry['seconds'] else None
+    return report
+
+def build_aoi_df(stats_dict):
+    """Assemble the per-date AOI DataFrame from the batched stats records."""
+    aoi_df = pd.DataFrame(stats_dict)
+    aoi_df['date'] = pd.to_datetime(aoi_df['date'])
+    aoi_df = aoi_df.sort_values('date')
+
+    # Convert area columns m²→km² and fill-na with 0
+    for col in aoi_df.columns:
+        if col.startswith('area_'):
+            aoi_df[col] = aoi_df[col].astype(float).div(1e6).round(4)  # km²
+
+    aoi_df.fillna(value=np.nan, inplace=True)
+    return aoi_df
 
 # ──────────────────────────────────────────────────────────────
 # PER-ZONE STATISTICS (mean only)
 # ──────────────────────────────────────────────────────────────
-if USE_ZONES:
-    print('➡️  Computing per-zone averages…')
-    def zonal_stats(img):
-        """Returns a FeatureCollection with one feature per zone & date."""
-        mean_reducer = ee.Reducer.mean()
-        fc = img.reduceRegions(
-            collection = zones_fc,
-            reducer    = mean_reducer,
-            scale      = 10,
-        ).map(lambda f: f.set({'date': img.date().format('YYYY-MM-dd')}))
-        return fc
-
-    zone_img_fc = idx_col.map(zonal_stats).flatten()
-    zones_dict = zone_img_fc.getInfo()['features']
+def zonal_stats(img, zone_map):
+    """Returns a FeatureCollection with one feature per touched zone & date.
+
+    `zone_map` is an `ee.Dictionary` {scene_id: [zone keys]} built from the
+    STRtree, so each scene only reduces over the zones under its footprint.
+    """
+    mean_reducer = ee.Reducer.mean()
+    touched = ee.List(zone_map.get(img.get('scene_id')))
+    fc = img.reduceRegions(
+        collection = zones_fc.filter(ee.Filter.inList('zone', touched)),
+        reducer    = mean_reducer,
+        scale      = 10,
+    ).map(lambda f: f.set({'date': img.date().format('YYYY-MM-dd'), 'sensor': img.get('sensor')}))
+    return fc
+
+def batch_zonal(scene_ids):
+    """Stage `zonal`: per-zone means for one batch of scenes."""
+    col = scene_collection(scene_ids)
+    footprints = col.aggregate_array('system:footprint').getInfo()
+    ids        = col.aggregate_array('scene_id').getInfo()
+    zone_map = {sid: zone_index.query(fp) for sid, fp in zip(ids, footprints)}
+    zone_map = {sid: keys for sid, keys in zone_map.items() if keys}
+    if not zone_map:
+        return []
+    zone_img_fc = (
+        col.filter(ee.Filter.inList('scene_id', list(zone_map)))
+        .map(lambda img: zonal_stats(img, ee.Dictionary(zone_map)))
+        .flatten()
+    )
+    return zone_img_fc.getInfo()['features']
+
+def build_zone_df(zones_dict):
+    """Flatten the batched zone features into a tidy DataFrame."""
+    if not zones_dict:
+        return pd.DataFrame()
     zone_df = pd.json_normalize(zones_dict)
     # Rename columns nicely: properties.<band>_mean → <band>
     zone_df = zone_df.rename(columns=lambda c: c.split('.')[-1])
     zone_df['date'] = pd.to_datetime(zone_df['date'])
-    zone_df = zone_df.sort_values(['id', 'date'])
-else:
-    zone_df = pd.DataFrame()
+    zone_df = zone_df.sort_values(['zone', 'date'])
+    return zone_df
 
 # ──────────────────────────────────────────────────────────────
-# TREND-BASED PREDICTIONS & ALERTS
+# PER-PIXEL CHANGE DETECTION (seasonal baseline)
 # ──────────────────────────────────────────────────────────────
-print('➡️  Generating simple linear predictions & alerts…')
-
-predictions = {}
-alerts      = []
-latest_date = aoi_df['date'].max()
-next_date   = latest_date + timedelta(days=10)
-
-for band in INDEX_BANDS:
-    col = f'{band}_mean'
-    if col not in aoi_df.columns:
-        continue
-    series = aoi_df[[col]].dropna().tail(PREDICT_WINDOW)
-    if len(series) < 2:
-        continue  # not enough points to fit
-    y = series[col].values.astype(float)
-    x = np.arange(len(y))
-    slope, intercept = np.polyfit(x, y, 1)
-    pred = float(slope * (len(y)) + intercept)
-    predictions[band] = {
-        'predicted_on' : next_date.strftime('%Y-%m-%d'),
-        'value'        : round(pred, 4),
-        'trend_slope'  : round(slope, 5),
+# Fixed 10 m UTM grid over the AOI so every scene lands on the same pixels.
+utm_crs = aoi_gdf.estimate_utm_crs()
+minx, miny, maxx, maxy = aoi_gdf.to_crs(utm_crs).total_bounds
+PIXEL_GRID = {
+    'dimensions'     : {'width' : int(np.ceil((maxx - minx) / 10)),
+                        'height': int(np.ceil((maxy - miny) / 10))},
+    'affineTransform': {'scaleX': 10, 'shearX': 0, 'translateX': float(minx),
+                        'shearY': 0, 'scaleY': -10, 'translateY': float(maxy)},
+    'crsCode'        : utm_crs.to_string(),
+}
+GRID_SHAPE = (PIXEL_GRID['dimensions']['height'], PIXEL_GRID['dimensions']['width'])
+NODATA = -9999.0
+
+def fetch_pixels(scene_id, pixel_dir):
+    """Stage `pixels`: download the change indices of one scene on the grid.
+
+    Returns `{scene, date, path}`; the (index, row, col) array is cached as
+    `.npy` so the sequential `change` stage never waits on EE.
+    """
+    img = scene_collection([scene_id]).first()
+    arr = ee.data.computePixels({
+        'expression': ee.Image(img).select(CHANGE_INDICES).toFloat().clip(aoi_geom).unmask(NODATA),
+        'fileFormat': 'NUMPY_NDARRAY',
+        'grid'      : PIXEL_GRID,
+    })
+    stack = np.stack([arr[band] for band in CHANGE_INDICES]).astype(np.float32)
+    stack[stack == NODATA] = np.nan
+    path = os.path.join(pixel_dir, f'{scene_id}.npy')
+    np.save(path, stack)
+    date_str = ee.Image(img).date().format('YYYY-MM-dd').getInfo()
+    return {'scene': scene_id, 'date': date_str, 'path': path}
+
+def grid_to_lonlat(row, col):
+    """Pixel centre (row, col) on PIXEL_GRID → [lon, lat]."""
+    x = minx + (col + 0.5) * 10
+    y = maxy - (row + 0.5) * 10
+    pt = gpd.GeoSeries(gpd.points_from_xy([x], [y]), crs=utm_crs).to_crs(4326).iloc[0]
+    return [round(pt.x, 6), round(pt.y, 6)]
+
+def detect_change(baseline, pixels, fold=True):
+    """Stage `change`: score one scene, then fold it into the baseline.
+
+    With `fold=False` (an earlier scene is still missing) the scene is only
+    scored: its pixels are kept, and the raster is marked provisional so the
+    next run scores it again once the gap is filled.
+    """
+    os.makedirs(os.path.join(OUT_DIR, 'anomalies'), exist_ok=True)
+    raster_path = os.path.join(OUT_DIR, 'anomalies', f"{pixels['date']}_{pixels['scene']}.npz")
+    doy = datetime.strptime(pixels['date'], '%Y-%m-%d').timetuple().tm_yday
+
+    # The raster is written *before* the baseline update, so after a crash it
+    # holds the score against the pre-update baseline — reuse it rather than
+    # scoring the scene against a window that may already contain it.
+    z = None
+    if os.path.isfile(raster_path):
+        with np.load(raster_path) as saved:
+            provisional = 'provisional' in saved.files and bool(saved['provisional'])
+            if str(saved['baseline']) == baseline.uid and not provisional:
+                z = saved['z']
+    if z is None:
+        stack = np.load(pixels['path'])
+        z = baseline.score(doy, stack)               # one vectorised pass, all indices
+        np.savez_compressed(raster_path, z=z, indices=np.array(CHANGE_INDICES),
+                            grid=json.dumps(PIXEL_GRID), baseline=baseline.uid,
+                            provisional=not fold)
+    if fold and pixels['scene'] not in baseline.scenes:
+        baseline.update(pixels['scene'], doy, np.load(pixels['path']))
+        os.remove(pixels['path'])                    # now lives in the baseline
+
+    regions = {}
+    for i, band in enumerate(CHANGE_INDICES):
+        found = summarise_regions(z[i], z_thr=CHANGE_Z_THR)
+        for reg in found:
+            reg['centroid'] = grid_to_lonlat(*reg.pop('centroid_rc'))
+        regions[band] = found
+    return {
+        'date'   : pixels['date'],
+        'scene'  : pixels['scene'],
+        'raster' : os.path.relpath(raster_path, OUT_DIR),
+        'scored' : bool(np.isfinite(z).any()),
+        'folded' : pixels['scene'] in baseline.scenes,
+        'regions': regions,
     }
-    # Simple alert rules
-    if band in THRESHOLDS:
-        low_thr = THRESHOLDS[band][0]
-        latest_val = float(aoi_df.iloc[-1][col])
-        if latest_val < low_thr:
-            alerts.append({
-                'date'  : latest_date.strftime('%Y-%m-%d'),
-                'index' : band,
-                'value' : round(latest_val, 4),
-                'type'  : 'low',
-                'msg'   : f'{band} dropped below {low_thr}',
-            })
+
+# ──────────────────────────────────────────────────────────────
+# TREND-BASED PREDICTIONS & ALERTS
+# ──────────────────────────────────────────────────────────────
+def forecast(*stats_batches):
+    """Stage `forecast`: simple linear predictions & alerts on the AOI means."""
+    aoi_df = build_aoi_df([rec for batch in stats_batches for rec in batch['records']])
+
+    predictions = {}
+    alerts      = []
+    latest_date = aoi_df['date'].max()
+    next_date   = latest_date + timedelta(days=10)
+
+    for band in INDEX_BANDS:
+        col = f'{band}_mean'
+        if col not in aoi_df.columns:
+            continue
+        series = aoi_df[[col]].dropna().tail(PREDICT_WINDOW)
+        if len(series) < 2:
+            continue  # not enough points to fit
+        y = series[col].values.astype(float)
+        x = np.arange(len(y))
+        slope, intercept = np.polyfit(x, y, 1)
+        pred = float(slope * (len(y)) + intercept)
+        predictions[band] = {
+            'predicted_on' : next_date.strftime('%Y-%m-%d'),
+            'value'        : round(pred, 4),
+            'trend_slope'  : round(float(slope), 5),
+        }
+        # Simple alert rules (on the latest scene that has this band —
+        # red-edge indices are missing on Landsat scenes)
+        if band in THRESHOLDS:
+            low_thr = THRESHOLDS[band][0]
+            latest_val = float(series[col].iloc[-1])
+            if latest_val < low_thr:
+                alerts.append({
+                    'date'  : aoi_df.loc[series.index[-1], 'date'].strftime('%Y-%m-%d'),
+                    'index' : band,
+                    'value' : round(latest_val, 4),
+                    'type'  : 'low',
+                    'msg'   : f'{band} dropped below {low_thr}',
+                })
+    return {'predictions': predictions, 'alerts': alerts}
 
 # ──────────────────────────────────────────────────────────────
 # LATEST NDVI TILE URL (for backdrop)
 # ──────────────────────────────────────────────────────────────
-latest_img = idx_col.sort('system:time_start', False).first()
-ndvi_latest = latest_img.select('NDVI')
-map_id = ndvi_latest.getMapId({'min': 0, 'max': 1, 'palette': ['brown', 'yellow', 'green']})
-tile_url = f"https://earthengine.googleapis.com/v1alpha/projects/earthengine-legacy/maps/{map_id['mapid']}/tiles/{{z}}/{{x}}/{{y}}?token={map_id['token']}"
+def latest_tile(scene_ids):
+    """Stage `tile`: map-tile URL template for the most recent NDVI."""
+    latest_img = scene_collection(scene_ids[-1:]).first()
+    ndvi_latest = latest_img.select('NDVI')
+    map_id = ndvi_latest.getMapId({'min': 0, 'max': 1, 'palette': ['brown', 'yellow', 'green']})
+    return f"https://earthengine.googleapis.com/v1alpha/projects/earthengine-legacy/maps/{map_id['mapid']}/tiles/{{z}}/{{x}}/{{y}}?token={map_id['token']}"
 
 # ──────────────────────────────────────────────────────────────
-# CONSOLIDATE → ONE JSON
+# EXPORT → LAZY, CONTENT-HASHED SECTIONS
 # ──────────────────────────────────────────────────────────────
-print('➡️  Writing consolidated JSON…')
-os.makedirs(OUT_DIR, exist_ok=True)
-
-output = {
-    'generated' : datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
-    'parameters': {
-        'aoi_geojson'  : os.path.abspath(AOI_GEOJSON),
-        'zones_geojson': os.path.abspath(ZONES_GEOJSON) if ZONES_GEOJSON else None,
-        'date_start'   : DATE_START,
-        'date_end'     : DATE_END,
-        'cloud_max_pct': CLOUD_MAX_PCT,
-        'thresholds'   : THRESHOLDS,
-    },
-    'aoi'         : json.loads(gpd.read_file(AOI_GEOJSON).to_json())['features'][0],
-    'timeseries'  : aoi_df.to_dict(orient='records'),
-    'tile_url'    : tile_url,
-    'predictions' : predictions,
-    'alerts'      : alerts,
-}
+def export(tile_url, forecast_out, stats_batches, zone_batches, anomalies):
+    """Stage `export`: refresh the dashboard sections that changed."""
+    report = sensor_report(stats_batches)
+    for sensor, entry in report.items():
+        print(f"   {sensor}: {entry['scenes']} scene(s), {entry['seconds']} s EE time, "
+              f"{entry['scenes_per_sec']} scenes/s")
+
+    print('➡️  Writing dashboard sections…')
+    writer = SectionWriter(SECTIONS_DIR)
+
+    # Section keys name everything a section is built from, so an unchanged
+    # section is skipped without being rebuilt.  `meta` has no key: its
+    # timestamp and tile token change on every run.
+    writer.add('meta', lambda: {
+        'generated' : datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'parameters': {
+            'aoi_geojson'  : os.path.abspath(AOI_GEOJSON),
+            'zones_geojson': os.path.abspath(ZONES_GEOJSON) if ZONES_GEOJSON else None,
+            'date_start'   : DATE_START,
+            'date_end'     : DATE_END,
+            'cloud_max_pct': CLOUD_MAX_PCT,
+            'thresholds'   : THRESHOLDS,
+        },
+        'tile_url'  : tile_url,
+        'sensors'   : report,
+    })
+    # The AOI only changes when its file does — reuse the in-memory GeoDataFrame.
+    writer.add(
+        'aoi',
+        lambda: to_geojson(aoi_gdf)['features'][0],
+        key=digest(file_digest(AOI_GEOJSON), SIMPLIFY_TOLERANCE_M),
+    )
+    writer.add('predictions', lambda: forecast_out['predictions'], key=digest(RUN_ID, forecast_key))
+    writer.add('alerts', lambda: forecast_out['alerts'], key=digest(RUN_ID, forecast_key))
+    scored = [a for a in anomalies if a and a['scored']]   # None = skipped scene
+    writer.add('anomalies', lambda: {
+        'indices': CHANGE_INDICES,
+        'z_thr'  : CHANGE_Z_THR,
+        'scenes' : scored,
+    }, key=digest(change_key, CHANGE_INDICES, [a['scene'] for a in scored]))
+
+    aoi_df = build_aoi_df([rec for batch in stats_batches for rec in batch['records']])
+    aoi_df['date'] = aoi_df['date'].dt.strftime('%Y-%m-%d')
+    add_timeseries_sections(
+        writer, aoi_df.to_dict(orient='records'),
+        # (checkpoints from before `scene_id` was recorded fall back to the date)
+        key=lambda group, rows: digest(RUN_ID, group, [(r['date'], r.get('scene_id')) for r in rows]),
+    )
 
-if USE_ZONES and not zone_df.empty:
-    # package zone stats as nested dict {zone_id: [records…]}
-    zones_package = {}
-    for zid, group in zone_df.groupby('zone'):
-        zones_package[str(zid)] = group.sort_values('date').to_dict(orient='records')
-    output['zones'] = zones_package
+    zone_df = build_zone_df([f for batch in zone_batches for f in batch])
+    if USE_ZONES and not zone_df.empty:
+        # package zone stats as nested dict {zone_id: [records…]}
+        zone_df['date'] = zone_df['date'].dt.strftime('%Y-%m-%d')
+        zones_package = {}
+        for zid, group in zone_df.groupby('zone'):
+            zones_package[str(zid)] = group.sort_values('date').to_dict(orient='records')
+        writer.add('zones', lambda: zones_package, key=digest(RUN_ID, scene_ids))
 
-with open(os.path.join(OUT_DIR, 'dashboard_data.json'), 'w', encoding='utf-8') as f:
-    json.dump(output, f, ensure_ascii=False, indent=2, default=str)
+    summary = writer.write()
+    print(f"   {len(summary['written'])} section(s) written, "
+          f"{len(summary['unchanged'])} unchanged, {len(summary['removed'])} removed.")
+    return summary
+
+# ──────────────────────────────────────────────────────────────
+# RUN THE TASK DAG (checkpointed & resumable)
+# ──────────────────────────────────────────────────────────────
+def digest(*parts):
+    """Short stable hash used to key checkpoints."""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+def file_digest(path):
+    """Hash of a file's bytes — editing a polygon in place changes it."""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+# Everything that changes the meaning of a scene's stats goes into the run id,
+# including the AOI / zone file *contents* — DATE_END does not, so tomorrow's
+# run reuses today's finished scene batches.
+RUN_ID = digest(
+    file_digest(AOI_GEOJSON),
+    file_digest(ZONES_GEOJSON) if USE_ZONES else None,
+    DATE_START, CLOUD_MAX_PCT, THRESHOLDS, INDEX_BANDS, SENSORS, SIMPLIFY_TOLERANCE_M,
+)
+sched = Scheduler(
+    os.path.join(CHECKPOINT_DIR, RUN_ID),
+    concurrency = STAGE_CONCURRENCY,
+    retries     = TASK_RETRIES,
+)
+
+print('➡️  Listing scenes…')
+fetch_task = sched.add(f'fetch-{DATE_END}', 'fetch', fetch_scenes)
+scene_ids  = sched.run()[fetch_task]
+if not scene_ids:
+    raise SystemExit('❌ No scenes match the AOI / date / cloud filters.')
+
+# Fixed-size batches from the oldest scene, one sensor per batch (so each EE
+# request times a single sensor): appending new scenes only ever invalidates
+# the last batch of each sensor, every earlier one is served from its checkpoint.
+by_sensor = {}
+for sid in scene_ids:
+    by_sensor.setdefault(sid.split('_', 1)[0], []).append(sid)
+batches = [
+    ids[i:i + SCENE_BATCH]
+    for ids in by_sensor.values()
+    for i in range(0, len(ids), SCENE_BATCH)
+]
+
+print(f'➡️  Computing per-image statistics in {len(batches)} batch(es)…')
+stats_tasks = [
+    sched.add(f'stats-{digest(batch)}', 'stats', lambda b=batch: batch_stats(b))
+    for batch in batches
+]
+zonal_tasks = []
+if USE_ZONES:
+    zonal_tasks = [
+        sched.add(f'zonal-{digest(batch)}', 'zonal', lambda b=batch: batch_zonal(b))
+        for batch in batches
+    ]
+
+print('➡️  Scoring per-pixel anomalies against the seasonal baseline…')
+pixel_dir     = os.path.join(sched.checkpoint_dir, 'pixels')
+os.makedirs(pixel_dir, exist_ok=True)
+# One baseline per change-detection layout; its uid changes whenever it is
+# (re)started empty, and is part of every pixels / change checkpoint name, so
+# a fresh baseline re-folds the whole history instead of resuming old results.
+baseline = SeasonalBaseline.open(
+    os.path.join(sched.checkpoint_dir, f'baseline-{digest(CHANGE_INDICES, BASELINE_DOY_BINS, BASELINE_DEPTH)}'),
+    len(CHANGE_INDICES), GRID_SHAPE,
+    doy_bins=BASELINE_DOY_BINS, depth=BASELINE_DEPTH,
+)
+change_key = digest(baseline.uid, CHANGE_Z_THR)
+# Each change task waits for its own pixels *and* the previous scene's change
+# task, so the baseline only ever contains scenes older than the one scored.
+# Both are soft: a scene whose download or scoring keeps failing is skipped
+# without holding up the export, and every later scene is then scored but not
+# folded in (`chain_intact`) — the next run retries the gap and folds in order.
+change_tasks = []
+for scene_id in scene_ids:
+    px = sched.add(f'pixels-{baseline.uid}-{scene_id}', 'pixels',
+                   lambda sid=scene_id: fetch_pixels(sid, pixel_dir), soft=True)
+    change_tasks.append(sched.add(
+        f'change-{change_key}-{scene_id}', 'change',
+        lambda pixels, *prev, sid=scene_id: (
+            detect_change(baseline, pixels, fold=chain_intact(*prev)) if pixels
+            else {'scene': sid, 'scored': False, 'folded': False}
+        ),
+        deps=[px] + change_tasks[-1:],
+        soft=True,
+    ))
+
+run_key       = digest(scene_ids)
+forecast_key  = digest(run_key, PREDICT_WINDOW)   # the fit window changes the forecast
+forecast_task = sched.add(f'forecast-{forecast_key}', 'forecast', forecast, deps=stats_tasks)
+tile_task     = sched.add(f'tile-{run_key}', 'tile',
+                          lambda: latest_tile(scene_ids), checkpoint=False)  # tokens expire
+n_stats, n_zonal = len(stats_tasks), len(zonal_tasks)
+export_task   = sched.add(
+    f'export-{run_key}', 'export',
+    lambda tile_url, forecast_out, *r: export(
+        tile_url, forecast_out,
+        r[:n_stats], r[n_stats:n_stats + n_zonal], r[n_stats + n_zonal:],
+    ),
+    deps=[tile_task, forecast_task] + stats_tasks + zonal_tasks + change_tasks,
+    checkpoint=False,
+)
 
-print(f'✅ dashboard_data.json written to {OUT_DIR}')
+sched.run()
+print(f'✅ Dashboard sections up to date in {SECTIONS_DIR}')
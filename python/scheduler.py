@@ -0,0 +1,195 @@
+"""
+Scheduler — checkpointed, resumable task DAG for the pipeline
+=============================================================
+A run of `pipeline_v3.py` is split into small tasks (scene batches for the
+per-image stages, one task each for the run-level stages).  Every task that
+finishes writes its result to a JSON checkpoint, so a run that dies half-way
+(an EE timeout in `getInfo()`, a bad tile request, a laptop going to sleep…)
+picks up from the last completed task the next time it is launched.
+
+Features
+--------
+* **DAG execution**: a task starts only once all of its dependencies are done;
+  it receives their results as positional arguments, in dependency order.
+* **Persisted checkpoints**: one `<task>.json` file per task inside the
+  checkpoint directory.  Writes are atomic (temp file + rename) so a crash
+  never leaves a half-written checkpoint behind.
+* **Retries with back-off**: transient failures are retried individually,
+  without touching the rest of the run.
+* **Bounded concurrency per stage**: e.g. at most 4 concurrent stats requests
+  but only 1 export.
+* **Incremental growth**: `run()` can be called several times on the same
+  scheduler, so tasks that depend on a dynamic result (the scene list) can be
+  added after it is known.
+* **Soft tasks**: a task marked `soft` that still fails after its retries
+  yields `None` instead of failing the run.  Tasks downstream of it still run
+  but are not checkpointed, so the next run retries the whole affected chain.
+
+Task results must be JSON-serialisable (lists / dicts / numbers / strings).
+"""
+
+import os
+import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class Task:
+    """A single unit of work inside the DAG."""
+
+    def __init__(self, name, stage, fn, deps=(), checkpoint=True, soft=False):
+        self.name       = name
+        self.stage      = stage
+        self.fn         = fn
+        self.deps       = list(deps)
+        self.checkpoint = checkpoint
+        self.soft       = soft
+
+
+class Scheduler:
+    """Runs a DAG of `Task`s with per-task checkpoints, retries and per-stage
+    concurrency limits."""
+
+    def __init__(self, checkpoint_dir, concurrency=None, retries=3, backoff=5.0):
+        self.checkpoint_dir = checkpoint_dir
+        self.concurrency    = dict(concurrency or {})   # stage → max parallel tasks
+        self.retries        = retries                   # extra attempts per task
+        self.backoff        = backoff                   # seconds, doubled per retry
+        self.tasks          = {}
+        self.results        = {}
+        self.degraded       = set()   # soft-failed tasks and everything downstream
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    # ──────────────────────────────────────────────────────────
+    # DAG construction
+    # ──────────────────────────────────────────────────────────
+    def add(self, name, stage, fn, deps=(), checkpoint=True, soft=False):
+        """Register a task and return its name (handy for wiring `deps`).
+
+        A `soft` task may fail without failing the run: its result is `None`.
+        """
+        if name in self.tasks:
+            raise ValueError(f'Duplicate task name: {name}')
+        for dep in deps:
+            if dep not in self.tasks:
+                raise ValueError(f'Task {name} depends on unknown task {dep}')
+        self.tasks[name] = Task(name, stage, fn, deps, checkpoint, soft)
+        return name
+
+    # ──────────────────────────────────────────────────────────
+    # Checkpoints
+    # ──────────────────────────────────────────────────────────
+    def _checkpoint_path(self, name):
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+        return os.path.join(self.checkpoint_dir, f'{safe}.json')
+
+    def _load_checkpoint(self, task):
+        path = self._checkpoint_path(task.name)
+        if not task.checkpoint or not os.path.isfile(path):
+            return False
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.results[task.name] = json.load(f)['result']
+        except (OSError, ValueError, KeyError):
+            return False  # corrupt / foreign file → just recompute
+        return True
+
+    def _save_checkpoint(self, task, result):
+        if not task.checkpoint:
+            return
+        path = self._checkpoint_path(task.name)
+        tmp  = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'task': task.name, 'stage': task.stage, 'result': result},
+                      f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+
+    # ──────────────────────────────────────────────────────────
+    # Execution
+    # ──────────────────────────────────────────────────────────
+    def _attempt(self, task, args):
+        """Run one task, retrying with exponential back-off."""
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                return task.fn(*args)
+            except Exception as exc:  # noqa: BLE001 — EE raises plain Exceptions
+                if attempt == self.retries:
+                    raise
+                print(f'   ⚠️  {task.name} failed ({exc}); retry {attempt + 1}/{self.retries} in {delay:.0f}s')
+                time.sleep(delay)
+                delay *= 2
+
+    def run(self):
+        """Execute every pending task and return the `{name: result}` dict.
+
+        Completed tasks are never rerun — either they finished earlier in this
+        process or their checkpoint is on disk.  If some task still fails
+        after its retries, the tasks that do not depend on it are allowed to
+        finish (and checkpoint) before a `RuntimeError` is raised — unless
+        the task is `soft`, in which case its dependants get `None` instead.
+        """
+        pending = [name for name in self.tasks if name not in self.results]
+        resumed = [name for name in pending if self._load_checkpoint(self.tasks[name])]
+        pending = [name for name in pending if name not in self.results]
+        if resumed:
+            print(f'   Resumed {len(resumed)} task(s) from checkpoints.')
+
+        failed  = {}
+        running = {}   # future → task
+        per_stage = {}
+
+        max_workers = max(1, sum(self.concurrency.values()) or 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                # Drop tasks whose upstream failed — they can never run.
+                for name in list(pending):
+                    if any(dep in failed for dep in self.tasks[name].deps):
+                        pending.remove(name)
+                        failed[name] = 'upstream failure'
+
+                # Submit every ready task the stage limits allow.
+                for name in list(pending):
+                    task = self.tasks[name]
+                    if not all(dep in self.results for dep in task.deps):
+                        continue
+                    limit = self.concurrency.get(task.stage, 1)
+                    if per_stage.get(task.stage, 0) >= limit:
+                        continue
+                    args = [self.results[dep] for dep in task.deps]
+                    running[pool.submit(self._attempt, task, args)] = task
+                    per_stage[task.stage] = per_stage.get(task.stage, 0) + 1
+                    pending.remove(name)
+
+                if not running:
+                    break  # nothing runnable left (everything else failed upstream)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    task = running.pop(fut)
+                    per_stage[task.stage] -= 1
+                    try:
+                        result = fut.result()
+                    except Exception as exc:  # noqa: BLE001
+                        if task.soft:
+                            print(f'   ⚠️  {task.name} failed ({exc}); continuing without it')
+                            self.results[task.name] = None
+                            self.degraded.add(task.name)
+                            continue
+                        failed[task.name] = repr(exc)
+                        print(f'   ❌ {task.name} failed permanently: {exc}')
+                        continue
+                    if any(dep in self.degraded for dep in task.deps):
+                        self.degraded.add(task.name)   # built on missing input → redo next run
+                    else:
+                        self._save_checkpoint(task, result)
+                    self.results[task.name] = result
+
+        if failed:
+            summary = ', '.join(f'{name} ({why})' for name, why in failed.items())
+            raise RuntimeError(
+                f'{len(failed)} task(s) did not complete: {summary}. '
+                f'Re-run to resume from {self.checkpoint_dir}.'
+            )
+        return self.results
@@ -0,0 +1,112 @@
+"""
+Sensor adapters — harmonised band roles across optical collections
+==================================================================
+Maps every supported collection onto the same **band roles** so the index
+and statistics code never sees sensor-specific band names:
+
+    BLUE, GREEN, RED, RE1, RE2, RE3, NIR      (surface reflectance, 0–1)
+
+Each adapter knows its collection id, scene-level cloud property, band
+mapping and the scale / offset that turns stored DNs into reflectance.
+Roles a sensor does not have (Landsat has no red-edge) are added as fully
+masked bands, so indices that need them come out as *no data* instead of
+being silently computed from the wrong wavelengths.
+
+Every harmonised image also carries:
+* `sensor`   — the adapter key (`S2`, `L8`, `L9`)
+* `scene_id` — `<sensor>_<system:index>`, unique across the merged stream
+
+No cross-sensor bandpass adjustment (e.g. OLI → MSI coefficients) is
+applied: Landsat and Sentinel-2 reflectances are merged as delivered, so
+small systematic offsets between sensors (a few hundredths of NDVI) remain
+in the merged series.  The `sensor` column lets the dashboard tell them apart.
+
+Sentinel-1 is deliberately absent: it is SAR backscatter and has no optical
+bands to map onto these roles.
+"""
+
+import ee
+
+BAND_ROLES = ['BLUE', 'GREEN', 'RED', 'RE1', 'RE2', 'RE3', 'NIR']
+
+SENSORS = {
+    'S2': {                                          # Sentinel-2 MSI, 10–20 m
+        'collection'    : 'COPERNICUS/S2_SR_HARMONIZED',
+        'cloud_property': 'CLOUDY_PIXEL_PERCENTAGE',
+        'scale'         : 1e-4,
+        'offset'        : 0.0,
+        'bands': {
+            'BLUE' : 'B2',
+            'GREEN': 'B3',
+            'RED'  : 'B4',
+            'RE1'  : 'B5',   # ≈ 705 nm
+            'RE2'  : 'B6',   # ≈ 740 nm
+            'RE3'  : 'B7',   # ≈ 783 nm
+            'NIR'  : 'B8',   # ≈ 842 nm
+        },
+    },
+    'L8': {                                          # Landsat 8 OLI, 30 m
+        'collection'    : 'LANDSAT/LC08/C02/T1_L2',
+        'cloud_property': 'CLOUD_COVER',
+        'scale'         : 2.75e-05,
+        'offset'        : -0.2,
+        'bands': {
+            'BLUE' : 'SR_B2',
+            'GREEN': 'SR_B3',
+            'RED'  : 'SR_B4',
+            'NIR'  : 'SR_B5',
+        },
+    },
+    'L9': {                                          # Landsat 9 OLI-2, 30 m
+        'collection'    : 'LANDSAT/LC09/C02/T1_L2',
+        'cloud_property': 'CLOUD_COVER',
+        'scale'         : 2.75e-05,
+        'offset'        : -0.2,
+        'bands': {
+            'BLUE' : 'SR_B2',
+            'GREEN': 'SR_B3',
+            'RED'  : 'SR_B4',
+            'NIR'  : 'SR_B5',
+        },
+    },
+}
+
+
+def harmonised_collection(sensor, geometry, date_start, date_end, cloud_max_pct):
+    """Filtered collection of one sensor with bands renamed to `BAND_ROLES`."""
+    cfg = SENSORS[sensor]
+    present = [role for role in BAND_ROLES if role in cfg['bands']]
+    missing = [role for role in BAND_ROLES if role not in cfg['bands']]
+
+    def to_roles(img):
+        out = (
+            img.select([cfg['bands'][role] for role in present], present)
+            .multiply(cfg['scale'])
+            .add(cfg['offset'])
+        )
+        for role in missing:
+            out = out.addBands(ee.Image.constant(0).toFloat().updateMask(0).rename(role))
+        return (
+            ee.Image(out.select(BAND_ROLES).copyProperties(img, ['system:time_start', 'system:footprint']))
+            .set({
+                'sensor'  : sensor,
+                'scene_id': ee.String(f'{sensor}_').cat(img.getString('system:index')),
+            })
+        )
+
+    return (
+        ee.ImageCollection(cfg['collection'])
+        .filterBounds(geometry)
+        .filterDate(date_start, date_end)
+        .filter(ee.Filter.lt(cfg['cloud_property'], cloud_max_pct))
+        .map(to_roles)
+    )
+
+
+def merged_collection(sensors, geometry, date_start, date_end, cloud_max_pct):
+    """All `sensors` merged into one time-ordered harmonised stream."""
+    merged = None
+    for sensor in sensors:
+        col = harmonised_collection(sensor, geometry, date_start, date_end, cloud_max_pct)
+        merged = col if merged is None else merged.merge(col)
+    return merged.sort('system:time_start', True)  # oldest → newest
@@ -0,0 +1,111 @@
+import time
+
+import numpy as np
+
+from change_detection import SeasonalBaseline, label_regions, summarise_regions
+
+
+def test_label_regions_counts_8_connected_components():
+    mask = np.zeros((5, 7), bool)
+    mask[0, 0] = mask[1, 1] = True        # diagonal neighbours → one region
+    mask[3, 6] = mask[4, 6] = True
+    mask[0, 5] = True
+    labels = label_regions(mask)
+    assert labels.max() == 3
+    assert labels[0, 0] == labels[1, 1]
+    assert (labels[~mask] == 0).all()
+
+
+def test_serpentine_mask_is_one_region():
+    mask = np.zeros((9, 9), bool)
+    mask[::2] = True
+    mask[1::4, -1] = mask[3::4, 0] = True   # join the rows end to end
+    labels = label_regions(mask)
+    assert labels.max() == 1 and (labels[mask] == 1).all()
+
+
+def test_region_summary_is_fast_on_a_full_size_grid():
+    # Default AOI grid: noisy scene (thousands of candidate regions), a
+    # field-wide anomaly and a serpentine mask (large region diameter).
+    shape = (511, 527)
+    noisy = 2.2 * np.random.default_rng(0).standard_normal(shape)
+    serpentine = np.zeros(shape, bool)
+    serpentine[::2] = True
+    serpentine[1::4, -1] = serpentine[3::4, 0] = True
+
+    t0 = time.perf_counter()
+    assert len(summarise_regions(noisy)) == 10
+    assert summarise_regions(np.full(shape, -5.0))[0]['n_pixels'] == shape[0] * shape[1]
+    assert label_regions(serpentine).max() == 1
+    assert time.perf_counter() - t0 < 3.0
+
+
+def test_region_stats():
+    z = np.zeros((6, 6))
+    z[1:3, 1:4] = [[-4.0, -5.0, -3.0], [-4.0, -6.0, -3.0]]
+    (region,) = summarise_regions(z)
+    assert region['n_pixels'] == 6
+    assert region['mean_z'] == -4.167 and region['extreme_z'] == -6.0
+    assert region['centroid_rc'] == [1.5, 2.0]
+
+
+def test_fully_anomalous_raster_is_one_region():
+    regions = summarise_regions(np.full((5, 5), -5.0))
+    assert len(regions) == 1
+    assert regions[0]['type'] == 'low'
+    assert regions[0]['n_pixels'] == 25
+
+
+def test_low_and_high_regions_are_separate():
+    z = np.zeros((6, 6))
+    z[:3, :3] = -4.0
+    z[3:, 3:] = 4.0
+    kinds = sorted(r['type'] for r in summarise_regions(z))
+    assert kinds == ['high', 'low']
+
+
+def test_score_flags_drop_against_baseline():
+    rng = np.random.default_rng(0)
+    base = SeasonalBaseline(1, (20, 20))
+    for year in range(5):
+        base.update(f's{year}', 100, 0.6 + 0.02 * rng.standard_normal((1, 20, 20)))
+    scene = 0.6 + 0.02 * rng.standard_normal((1, 20, 20))
+    scene[0, 5:10, 5:10] = 0.2
+    z = base.score(105, scene)
+    assert (z[0, 5:10, 5:10] < -3).all()
+    assert summarise_regions(z[0])[0]['n_pixels'] >= 25
+
+
+def test_update_keeps_history_where_scene_has_no_data():
+    base = SeasonalBaseline(1, (2, 2), depth=1)
+    base.update('a', 10, np.ones((1, 2, 2)))
+    scene = np.full((1, 2, 2), 5.0)
+    scene[0, 0, 0] = np.nan
+    base.update('b', 10, scene)
+    np.testing.assert_array_equal(base.buffer[base.doy_bin(10), 0, 0], [[1, 5], [5, 5]])
+
+
+def test_persistent_baseline_round_trip(tmp_path):
+    base = SeasonalBaseline.open(str(tmp_path), 1, (3, 4), doy_bins=4, depth=2)
+    base.update('s1', 50, np.full((1, 3, 4), 0.5))
+    uid = base.uid
+
+    again = SeasonalBaseline.open(str(tmp_path), 1, (3, 4), doy_bins=4, depth=2)
+    assert again.uid == uid
+    assert again.scenes == ['s1']
+    assert again.cursor[again.doy_bin(50)] == 1
+    np.testing.assert_array_equal(again.buffer[again.doy_bin(50), 0, 0], 0.5)
+
+    # Re-folding a scene is a no-op
+    again.update('s1', 50, np.full((1, 3, 4), 9.0))
+    assert again.cursor[again.doy_bin(50)] == 1
+
+
+def test_persistent_baseline_restarts_on_layout_change(tmp_path):
+    base = SeasonalBaseline.open(str(tmp_path), 1, (3, 4), doy_bins=4, depth=2)
+    base.update('s1', 50, np.full((1, 3, 4), 0.5))
+
+    other = SeasonalBaseline.open(str(tmp_path), 1, (5, 5), doy_bins=4, depth=2)
+    assert other.uid != base.uid
+    assert other.scenes == []
+    assert np.isnan(other.buffer).all()
@@ -0,0 +1,70 @@
+import json
+import os
+
+from dashboard_export import MANIFEST, SectionWriter, add_timeseries_sections
+
+
+def _manifest(out):
+    with open(os.path.join(out, MANIFEST), encoding='utf-8') as f:
+        return json.load(f)['sections']
+
+
+def test_matching_key_skips_the_builder(tmp_path):
+    writer = SectionWriter(str(tmp_path))
+    writer.add('aoi', lambda: {'name': 'field'}, key='k1')
+    assert writer.write()['written'] == ['aoi']
+
+    def boom():
+        raise AssertionError('builder should not run')
+
+    writer = SectionWriter(str(tmp_path))
+    writer.add('aoi', boom, key='k1')
+    assert writer.write()['unchanged'] == ['aoi']
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    writer = SectionWriter(str(tmp_path))
+    writer.add('meta', lambda: {'a': 1})
+    writer.write()
+    mtime = os.path.getmtime(tmp_path / 'meta.json')
+
+    writer = SectionWriter(str(tmp_path))
+    writer.add('meta', lambda: {'a': 1})
+    assert writer.write()['unchanged'] == ['meta']
+    assert os.path.getmtime(tmp_path / 'meta.json') == mtime
+
+
+def test_dropped_section_is_removed(tmp_path):
+    writer = SectionWriter(str(tmp_path))
+    writer.add('meta', lambda: {})
+    writer.add('zones', lambda: {'z1': []})
+    writer.write()
+
+    writer = SectionWriter(str(tmp_path))
+    writer.add('meta', lambda: {})
+    assert writer.write()['removed'] == ['zones']
+    assert not (tmp_path / 'zones.json').exists()
+    assert set(_manifest(str(tmp_path))) == {'meta'}
+
+
+def test_nan_becomes_null(tmp_path):
+    writer = SectionWriter(str(tmp_path))
+    writer.add('predictions', lambda: {'NDVI': float('nan'), 'rows': [float('inf'), 0.5]})
+    writer.write()
+    assert json.loads((tmp_path / 'predictions.json').read_text()) == {'NDVI': None, 'rows': [None, 0.5]}
+
+
+def test_timeseries_split_by_group_and_year(tmp_path):
+    rows = [
+        {'date': '2024-12-30', 'sensor': 'S2', 'scene_id': 'a', 'NDVI_mean': 0.4, 'area_NDVI_0_5': 1.0},
+        {'date': '2025-01-04', 'sensor': 'L9', 'scene_id': 'b', 'NDVI_mean': 0.5, 'area_NDVI_0_5': 2.0},
+    ]
+    writer = SectionWriter(str(tmp_path))
+    add_timeseries_sections(writer, rows, key=lambda group, rs: f"{group}-{[r['scene_id'] for r in rs]}")
+    writer.write()
+
+    sections = _manifest(str(tmp_path))
+    assert sections['timeseries-means-2025']['key'] == "means-['b']"
+    assert json.loads((tmp_path / 'timeseries-means-2024.json').read_text()) == [
+        {'date': '2024-12-30', 'sensor': 'S2', 'NDVI_mean': 0.4},
+    ]
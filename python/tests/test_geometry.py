@@ -0,0 +1,86 @@
+import geopandas as gpd
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, box, mapping
+
+from geometry import ZoneIndex, simplify_polygons, vertex_count
+
+
+def _zones():
+    return gpd.GeoDataFrame(
+        {'zone': ['inside', 'edge', 'outside']},
+        geometry=[box(2, 2, 3, 3), box(9, 4, 11, 5), box(20, 20, 21, 21)],
+        crs=4326,
+    )
+
+
+def test_footprint_ring_matches_zones_fully_inside():
+    # system:footprint as returned by getInfo(): a LinearRing, not a Polygon
+    footprint = {
+        'type': 'LinearRing',
+        'coordinates': [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+    }
+    assert sorted(ZoneIndex(_zones()).query(footprint)) == ['edge', 'inside']
+
+
+def test_polygon_query():
+    assert ZoneIndex(_zones()).query(mapping(box(19, 19, 22, 22))) == ['outside']
+
+
+def test_adjacent_zones_keep_a_shared_edge():
+    # Two fields split by a noisy border (±3 m); the east ring starts part-way
+    # along it, so simplifying each polygon alone would not agree on the edge.
+    x0, x1, y0, y1 = -60.0, -59.99, -34.0, -33.99
+    rng = np.random.default_rng(0)
+    border = [(-59.995 + 3e-5 * rng.standard_normal(), y0 + i * (y1 - y0) / 100) for i in range(101)]
+    east = border + [(x1, y1), (x1, y0)]
+    zones = gpd.GeoDataFrame(
+        {'zone': ['west', 'east']},
+        geometry=[Polygon([(x0, y0)] + border + [(x0, y1)]), Polygon(east[37:] + east[:37])],
+        crs=4326,
+    )
+
+    out = simplify_polygons(zones, tolerance_m=5.0)
+    assert vertex_count(out) < vertex_count(zones)
+
+    a, b = out.to_crs(out.estimate_utm_crs()).geometry
+    assert shapely.hausdorff_distance(zones.to_crs(out.estimate_utm_crs()).geometry.values,
+                                      np.array([a, b])).max() <= 5.0 + 1e-6
+    union = a.union(b)
+    assert a.area + b.area - union.area < 1e-3              # no overlap
+    assert union.geom_type == 'Polygon' and not list(union.interiors)   # no gap
+
+
+def _spiky_field(x0=500_000.0, y0=6_240_000.0):
+    # 1000 m square with a 40 m × 1 m spike on its north side (UTM 20S, metres)
+    return Polygon([
+        (x0, y0), (x0 + 1000, y0), (x0 + 1000, y0 + 1000),
+        (x0 + 500.5, y0 + 1000), (x0 + 500, y0 + 1040), (x0 + 499.5, y0 + 1000),
+        (x0, y0 + 1000),
+    ])
+
+
+def _max_deviation(before, after):
+    utm = before.crs
+    return shapely.hausdorff_distance(before.geometry.values, after.to_crs(utm).geometry.values).max()
+
+
+def test_single_polygon_stays_within_tolerance():
+    field = gpd.GeoDataFrame({'name': ['field']}, geometry=[_spiky_field()], crs=32720)
+    out = simplify_polygons(field, tolerance_m=5.0)
+    assert _max_deviation(field, out) <= 5.0 + 1e-6
+
+
+def test_zone_coverage_stays_within_tolerance():
+    field = _spiky_field()
+    x0, y0 = field.bounds[:2]
+    zones = gpd.GeoDataFrame(
+        {'zone': ['north', 'south']},
+        geometry=[field.intersection(box(x0, y0 + 500, x0 + 1000, y0 + 1040)),
+                  box(x0, y0, x0 + 1000, y0 + 500)],
+        crs=32720,
+    )
+    out = simplify_polygons(zones, tolerance_m=5.0)
+    assert _max_deviation(zones, out) <= 5.0 + 1e-6
+    a, b = out.to_crs(32720).geometry
+    assert a.area + b.area - a.union(b).area < 1e-3
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from scheduler import Scheduler
+
+
+def _dag(ckpt, calls, fail=()):
+    sched = Scheduler(str(ckpt), concurrency={'stats': 2}, retries=0, backoff=0)
+
+    def work(name, value):
+        def fn(*deps):
+            calls.append(name)
+            if name in fail:
+                raise RuntimeError(f'{name} failed')
+            return value + sum(deps)
+        return fn
+
+    sched.add('fetch', 'fetch', work('fetch', 1))
+    for i in range(3):
+        sched.add(f'stats-{i}', 'stats', work(f'stats-{i}', 10 * i), deps=['fetch'])
+    sched.add('export', 'export', work('export', 0), deps=[f'stats-{i}' for i in range(3)])
+    return sched
+
+
+def test_runs_dag_in_dependency_order(tmp_path):
+    calls = []
+    results = _dag(tmp_path, calls).run()
+    assert calls[0] == 'fetch' and calls[-1] == 'export'
+    assert results['export'] == (1 + 0) + (1 + 10) + (1 + 20)
+
+
+def test_resumes_from_checkpoints_after_failure(tmp_path):
+    calls = []
+    with pytest.raises(RuntimeError, match='export'):
+        _dag(tmp_path, calls, fail={'export'}).run()
+
+    calls.clear()
+    assert _dag(tmp_path, calls).run()['export'] == 33
+    assert calls == ['export']
+
+
+def test_retries_transient_failures(tmp_path):
+    sched = Scheduler(str(tmp_path), retries=2, backoff=0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TimeoutError('ee timeout')
+        return 'ok'
+
+    sched.add('fetch', 'fetch', flaky)
+    assert sched.run()['fetch'] == 'ok'
+    assert len(attempts) == 3
+
+
+def test_downstream_of_failed_task_is_skipped(tmp_path):
+    calls = []
+    with pytest.raises(RuntimeError, match='upstream failure'):
+        _dag(tmp_path, calls, fail={'stats-1'}).run()
+    assert 'export' not in calls
+
+
+def test_soft_failure_does_not_block_downstream(tmp_path):
+    def chain(calls, fail=()):
+        sched = Scheduler(str(tmp_path), retries=0, backoff=0)
+        prev = []
+        for i in range(3):
+            def fn(*_, i=i):
+                calls.append(i)
+                if i in fail:
+                    raise RuntimeError('no pixels')
+                return i
+            prev = [sched.add(f'change-{i}', 'change', fn, deps=prev, soft=True)]
+        sched.add('export', 'export', lambda last: last, deps=prev)
+        return sched
+
+    calls = []
+    results = chain(calls, fail={1}).run()
+    assert results['change-1'] is None
+    assert results['export'] == 2 and calls == [0, 1, 2]
+
+    # Only the scene before the failure was checkpointed; the rest is redone.
+    calls.clear()
+    assert chain(calls).run()['export'] == 2
+    assert calls == [1, 2]
+
+
+def test_change_chain_folds_scenes_in_date_order(tmp_path):
+    # Mirrors the pipeline's soft pixels → change chain over a real baseline.
+    from change_detection import SeasonalBaseline, chain_intact
+
+    base = SeasonalBaseline.open(str(tmp_path / 'baseline'), 1, (2, 2), doy_bins=1)
+    scenes = ['s0', 's1', 's2', 's3']
+
+    def chain(broken=()):
+        sched = Scheduler(str(tmp_path / 'ckpt'), retries=0, backoff=0)
+        prev = []
+        for sid in scenes:
+            def pixels(sid=sid):
+                if sid in broken:
+                    raise RuntimeError('computePixels failed')
+                return sid
+
+            def change(px, *previous, sid=sid):
+                if px is None:
+                    return {'scene': sid, 'folded': False}
+                if chain_intact(*previous):
+                    base.update(sid, 100, np.zeros((1, 2, 2)))
+                return {'scene': sid, 'folded': sid in base.scenes}
+
+            px = sched.add(f'pixels-{sid}', 'pixels', pixels, soft=True)
+            prev = [sched.add(f'change-{sid}', 'change', change, deps=[px] + prev, soft=True)]
+        sched.add('export', 'export', lambda last: last, deps=prev, checkpoint=False)
+        return sched
+
+    chain(broken={'s1'}).run()
+    assert base.scenes == ['s0']                   # s2, s3 scored but not folded
+
+    chain().run()
+    assert base.scenes == scenes
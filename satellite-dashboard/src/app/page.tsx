@@ -1,3 +1,6 @@
+'use client';
+
+import type { ComponentProps } from 'react';
 import { Badge } from '@/components/ui/badge';
 import { Alert, AlertDescription } from '@/components/ui/alert';
 import { AlertTriangle, TrendingDown, TrendingUp } from 'lucide-react';
@@ -12,11 +15,63 @@ import {
   CardHeader,
   CardTitle,
 } from '@/components/ui/card';
-import dashboardData from '@/data/dashboard_data.json';
+import { useSection, useTimeseries } from '@/lib/dashboard-data';
+
+type Predictions = ComponentProps<typeof PredictionsChart>['predictions'];
+type AOI = ComponentProps<typeof AOIMap>['aoi'];
+
+interface Meta {
+  generated: string;
+  parameters: { date_start: string; date_end: string };
+  tile_url: string;
+}
+
+interface AlertItem {
+  date: string;
+  index: string;
+  value: number;
+  msg: string;
+}
+
+// Stand-in for a card whose section has not arrived yet.
+function LoadingCard({
+  title,
+  description,
+}: {
+  title: string;
+  description: string;
+}) {
+  return (
+    <Card>
+      <CardHeader>
+        <CardTitle>{title}</CardTitle>
+        <CardDescription>{description}</CardDescription>
+      </CardHeader>
+      <CardContent>
+        <div className='flex h-[300px] items-center justify-center text-sm text-muted-foreground'>
+          Loading…
+        </div>
+      </CardContent>
+    </Card>
+  );
+}
 
 export default function Dashboard() {
-  const { timeseries, aoi, predictions, alerts, parameters } = dashboardData;
+  // Each view only pulls the sections it renders (see python/dashboard_export.py).
+  const meta = useSection<Meta>('meta');
+  const aoi = useSection<AOI>('aoi');
+  const predictions = useSection<Predictions>('predictions');
+  const alerts = useSection<AlertItem[]>('alerts');
+  const means =
+    useTimeseries<ComponentProps<typeof TemporalChart>['data'][number]>(
+      'means',
+    );
+  const areas =
+    useTimeseries<ComponentProps<typeof AreaCoverageChart>['data'][number]>(
+      'area',
+    );
 
+  // Every card renders as soon as its own sections have arrived.
   return (
     <div className='min-h-screen bg-background p-4 md:p-6 lg:p-8'>
       <div className='mx-auto max-w-7xl space-y-6'>
@@ -26,13 +81,14 @@ export default function Dashboard() {
             Satellite Data Dashboard
           </h1>
           <p className='text-muted-foreground'>
-            Monitoring area from {parameters.date_start} to{' '}
-            {parameters.date_end}
+            {meta
+              ? `Monitoring area from ${meta.parameters.date_start} to ${meta.parameters.date_end}`
+              : 'Loading…'}
           </p>
         </div>
 
         {/* Alerts */}
-        {alerts.length > 0 && (
+        {alerts && alerts.length > 0 && (
           <div className='space-y-2'>
             {alerts.map((alert, index) => (
               <Alert key={index} className='border-amber-200 bg-amber-50'>
@@ -50,62 +106,97 @@ export default function Dashboard() {
         <div className='grid gap-6 lg:grid-cols-3'>
           {/* Map Section */}
           <div className='lg:col-span-1'>
-            <Card>
-              <CardHeader>
-                <CardTitle>Area of Interest</CardTitle>
-                <CardDescription>
-                  Satellite view of monitored region
-                </CardDescription>
-              </CardHeader>
-              <CardContent>
-                <AOIMap aoi={aoi} tileUrl={dashboardData.tile_url} />
-              </CardContent>
-            </Card>
+            {aoi && meta ? (
+              <Card>
+                <CardHeader>
+                  <CardTitle>Area of Interest</CardTitle>
+                  <CardDescription>
+                    Satellite view of monitored region
+                  </CardDescription>
+                </CardHeader>
+                <CardContent>
+                  <AOIMap aoi={aoi} tileUrl={meta.tile_url} />
+                </CardContent>
+              </Card>
+            ) : (
+              <LoadingCard
+                title='Area of Interest'
+                description='Satellite view of monitored region'
+              />
+            )}
           </div>
 
           {/* Charts Section */}
           <div className='space-y-6 lg:col-span-2'>
             {/* Predictions Summary */}
-            <Card>
-              <CardHeader>
-                <CardTitle>Current Predictions</CardTitle>
-                <CardDescription>
-                  Forecasted values for {predictions.NDVI.predicted_on}
-                </CardDescription>
-              </CardHeader>
-              <CardContent>
-                <div className='grid grid-cols-2 gap-4 md:grid-cols-5'>
-                  {Object.entries(predictions).map(([index, data]) => (
-                    <div key={index} className='space-y-1 text-center'>
-                      <div className='text-sm font-medium text-muted-foreground'>
-                        {index}
-                      </div>
-                      <div className='text-lg font-bold'>
-                        {data.value.toFixed(3)}
+            {predictions ? (
+              <Card>
+                <CardHeader>
+                  <CardTitle>Current Predictions</CardTitle>
+                  <CardDescription>
+                    Forecasted values for {predictions.NDVI.predicted_on}
+                  </CardDescription>
+                </CardHeader>
+                <CardContent>
+                  <div className='grid grid-cols-2 gap-4 md:grid-cols-5'>
+                    {Object.entries(predictions).map(([index, data]) => (
+                      <div key={index} className='space-y-1 text-center'>
+                        <div className='text-sm font-medium text-muted-foreground'>
+                          {index}
+                        </div>
+                        <div className='text-lg font-bold'>
+                          {data.value.toFixed(3)}
+                        </div>
+                        <Badge
+                          variant={
+                            data.trend_slope > 0 ? 'default' : 'destructive'
+                          }
+                          className='text-xs'
+                        >
+                          {data.trend_slope > 0 ? (
+                            <TrendingUp className='mr-1 h-3 w-3' />
+                          ) : (
+                            <TrendingDown className='mr-1 h-3 w-3' />
+                          )}
+                          {(data.trend_slope * 100).toFixed(2)}%
+                        </Badge>
                       </div>
-                      <Badge
-                        variant={
-                          data.trend_slope > 0 ? 'default' : 'destructive'
-                        }
-                        className='text-xs'
-                      >
-                        {data.trend_slope > 0 ? (
-                          <TrendingUp className='mr-1 h-3 w-3' />
-                        ) : (
-                          <TrendingDown className='mr-1 h-3 w-3' />
-                        )}
-                        {(data.trend_slope * 100).toFixed(2)}%
-                      </Badge>
-                    </div>
-                  ))}
-                </div>
-              </CardContent>
-            </Card>
+                    ))}
+                  </div>
+                </CardContent>
+              </Card>
+            ) : (
+              <LoadingCard
+                title='Current Predictions'
+                description='Forecasted values for the next scene'
+              />
+            )}
 
             {/* Self-contained Charts */}
-            <TemporalChart data={timeseries} />
-            <AreaCoverageChart data={timeseries} />
-            <PredictionsChart data={timeseries} predictions={predictions} />
+            {means ? (
+              <TemporalChart data={means} />
+            ) : (
+              <LoadingCard
+                title='Vegetation Index Temporal Analysis'
+                description='Mean vegetation indices over time'
+              />
+            )}
+            {areas ? (
+              <AreaCoverageChart data={areas} />
+            ) : (
+              <LoadingCard
+                title='Vegetation Index Coverage'
+                description='Area coverage by vegetation health indices over time'
+              />
+            )}
+            {means && predictions ? (
+              <PredictionsChart data={means} predictions={predictions} />
+            ) : (
+              <LoadingCard
+                title='Trend Analysis & Predictions'
+                description='Historical data with forecasted values'
+              />
+            )}
           </div>
         </div>
       </div>
@@ -0,0 +1,91 @@
+'use client';
+
+import { useEffect, useState } from 'react';
+
+// Sections written by python/dashboard_export.py (see manifest.json there).
+const DASHBOARD_BASE = '/dashboard';
+
+interface SectionEntry {
+  path: string;
+  hash: string;
+  bytes: number;
+}
+
+interface Manifest {
+  generated: string;
+  sections: Record<string, SectionEntry>;
+}
+
+// One in-flight / resolved request per URL, shared by every component.
+const cache = new Map<string, Promise<unknown>>();
+
+function fetchJson<T>(url: string): Promise<T> {
+  if (!cache.has(url)) {
+    cache.set(
+      url,
+      fetch(url).then(res => {
+        if (!res.ok) throw new Error(`${url}: ${res.status}`);
+        return res.json();
+      }),
+    );
+  }
+  return cache.get(url) as Promise<T>;
+}
+
+let manifestPromise: Promise<Manifest> | null = null;
+
+function getManifest(): Promise<Manifest> {
+  // The manifest is tiny and always fresh; sections are immutable per hash.
+  manifestPromise ??= fetch(`${DASHBOARD_BASE}/manifest.json`, {
+    cache: 'no-store',
+  }).then(res => {
+    if (!res.ok) throw new Error(`manifest.json: ${res.status}`);
+    return res.json();
+  });
+  return manifestPromise;
+}
+
+function fetchSection<T>(manifest: Manifest, name: string): Promise<T> {
+  const entry = manifest.sections[name];
+  if (!entry) return Promise.reject(new Error(`Unknown section: ${name}`));
+  return fetchJson<T>(`${DASHBOARD_BASE}/${entry.path}?v=${entry.hash}`);
+}
+
+function useAsync<T>(load: () => Promise<T>, deps: unknown[]): T | undefined {
+  const [value, setValue] = useState<T>();
+
+  useEffect(() => {
+    let active = true;
+    load()
+      .then(result => active && setValue(result))
+      .catch(err => console.error(err));
+    return () => {
+      active = false;
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, deps);
+
+  return value;
+}
+
+/** A single dashboard section (`meta`, `aoi`, `predictions`, …), fetched on first use. */
+export function useSection<T>(name: string): T | undefined {
+  return useAsync(() => getManifest().then(m => fetchSection<T>(m, name)), [name]);
+}
+
+/**
+ * One timeseries column group (`means`, `spread` or `area`), stitched
+ * together from its per-year sections in date order.
+ */
+export function useTimeseries<T>(group: string): T[] | undefined {
+  return useAsync(async () => {
+    const manifest = await getManifest();
+    const names = Object.keys(manifest.sections)
+      .filter(name => name.startsWith(`timeseries-${group}-`))
+      .sort();
+    const chunks = await Promise.all(
+      names.map(name => fetchSection<T[]>(manifest, name)),
+    );
+    return chunks.flat();
+  }, [group]);
+}